@@ -23,19 +23,28 @@ import os
 
 class Database(object):
 
+    @classmethod
+    def distribution_path(cls):
+        # The installed distributions are scanned the first time the path
+        # is queried and cached after that, so the same path should be
+        # shared when looking for more than one package.
+        return DistributionPath(include_egg=True)
+
     @classmethod
     def check_installed(cls, requirement):
-        path = DistributionPath(include_egg=True)
+        path = cls.distribution_path()
         package_name = util.parse_requirement(requirement).name
         return path.get_distribution(package_name) is not None
 
     @classmethod
-    def uninstall(self, requirement):
+    def uninstall(cls, requirement, dist_path=None):
+        if dist_path is None:
+            dist_path = cls.distribution_path()
+
         # Currently we assume the distribution path contains only the last
         # version installed
         package_name = util.parse_requirement(requirement).name
-        distribution = DistributionPath(include_egg=True).get_distribution(
-            package_name)
+        distribution = dist_path.get_distribution(package_name)
 
         # Oh distlib, if the distribution doesn't exist, we'll get None here
         if not distribution:
@@ -27,14 +27,14 @@ import shutil
 FORMATS = ('whl', 'gz', 'bz', 'zip')
 
 PKG_NAMES = [
-    r'([\w\-\_\.]+)-([\d\.]+\d)[\.\-]',
-    r'(\w+)-(.+)\.\w+$',
+    re.compile(r'([\w\-\_\.]+)-([\d\.]+\d)[\.\-]'),
+    re.compile(r'(\w+)-(.+)\.\w+$'),
 ]
 
 
 def pkg_name(name):
     for expr in PKG_NAMES:
-        result = re.findall(expr, name)
+        result = expr.findall(name)
         if result:
             return result[0]
 
@@ -31,19 +31,21 @@ from .services.downloader import Finder, Downloader
 from .services.curdler import Curdler
 from .services.dependencer import Dependencer
 from .services.installer import Installer
-from .services.uploader import Uploader
+from .services.uploader import Uploader, MAX_CONCURRENCY as UPLOAD_CONCURRENCY
 
 import os
 import sys
-import time
+import threading
 import traceback
 import math
 import multiprocessing
 
 
-PACKAGE_BLACKLIST = (
+# Package names we never install. Matched against the whole name, so
+# packages like `setuptools-git` are not affected.
+PACKAGE_BLACKLIST = frozenset([
     'setuptools',
-)
+])
 
 
 def only(func, field):
@@ -63,6 +65,8 @@ def unique(func, install):
         else:
             install.mapping.repeated.append(data['requirement'])
             install.mapping.requirements.discard(data['requirement'])
+            install.directly_required.pop(
+                parse_requirement(data['requirement']).name, None)
     return wrapper
 
 
@@ -84,13 +88,22 @@ class Install(Service):
         # Track dependencies and requirements to be installed
         self.mapping = Mapping()
 
-        # General params for all the services
-        args = self.conf
-        args.update({
+        # Remembers `Mapping.was_directly_required()` for each package
+        # name, since `handle()` is called once per dependency found
+        self.directly_required = {}
+
+        # Set by the services every time they finish or fail to process
+        # a package, so the loops below can wake up right away instead
+        # of polling the mapping.
+        self._tick = threading.Event()
+
+        # General params for all the services. Everything else they need
+        # is read from `conf`.
+        args = {
             'env': self,
             'index': self.index,
             'conf': self.conf,
-        })
+        }
 
         cpu_count = multiprocessing.cpu_count()
         p = lambda n: max(int(math.floor((cpu_count / 8.0) * n)), 1)
@@ -118,18 +131,24 @@ class Install(Service):
 
         # Error report, let's just remember what happened
         def update_error_list(name, **data):
-            package_name = parse_requirement(data['requirement']).name
-            self.mapping.errors[package_name][data['requirement']] = {
-                'exception': data['exception'],
-                'dependency_of': [data.get('dependency_of')],
-            }
+            self.mapping.file_error(
+                data['requirement'], data['exception'],
+                data.get('dependency_of'))
 
         # Count how many packages we have in each place
         def update_count(name, **data):
             self.mapping.stats[name] += 1
 
+        # Wake up whoever is waiting for the mapping to change. It must be
+        # connected after the callbacks above, so the counters are already
+        # updated when the waiting loop checks them again.
+        def tick(name, **data):
+            self._tick.set()
+
         [(s.connect('finished', update_count),
-          s.connect('failed', update_error_list)) for s in [
+          s.connect('failed', update_error_list),
+          s.connect('finished', tick),
+          s.connect('failed', tick)) for s in [
             self.finder, self.downloader, self.curdler,
             self.dependencer, self.installer, self.uploader,
         ]]
@@ -150,7 +169,7 @@ class Install(Service):
     def set_tarball(self, data):
         try:
             data['tarball'] = \
-                self.index.get("{0};~whl".format(data['requirement']))
+                self.index.get(data['requirement'] + ';~whl')
             return True
         except PackageNotFound:
             return False
@@ -158,25 +177,34 @@ class Install(Service):
     def set_wheel(self, data):
         try:
             data['wheel'] = \
-                self.index.get("{0};whl".format(data['requirement']))
+                self.index.get(data['requirement'] + ';whl')
             return True
         except PackageNotFound:
             return False
 
     def handle(self, requester, **data):
         requirement = safe_name(data['requirement'])
-        if not is_url(requirement) and parse_requirement(requirement).name in PACKAGE_BLACKLIST:
+        package_name = parse_requirement(requirement).name
+        if not is_url(requirement) and package_name in PACKAGE_BLACKLIST:
             return
 
         # Filter duplicated requirements
         if requirement in self.mapping.requirements:
             return
-        # Filter previously primarily required packages
-        if self.mapping.was_directly_required(requirement):
+        # Filter previously primarily required packages. `unique()` might
+        # drop the entry from a worker thread at any time, so it's read
+        # just once.
+        directly_required = self.directly_required.get(package_name)
+        if directly_required is None:
+            directly_required = self.mapping.was_directly_required(requirement)
+            self.directly_required[package_name] = directly_required
+        if directly_required:
             return
         # Save the requirement and its requester for later
         self.mapping.requirements.add(requirement)
         self.mapping.dependencies[requirement].append(data.get('dependency_of'))
+        if data.get('dependency_of') is None:
+            self.directly_required[package_name] = True
 
         # Defining which place we're moving our requirements
         service = self.finder
@@ -195,13 +223,15 @@ class Install(Service):
         # Failures will be collected and forwarded to the caller.
         errors = defaultdict(dict)
         installable_packages = self.mapping.installable_packages()
+        requirements = self.mapping.requirements_by_package_name()
         for package_name in installable_packages:
             try:
-                _, chosen_requirement = self.mapping.best_version(package_name)
+                _, chosen_requirement = self.mapping.best_version(
+                    package_name, requirements=requirements[package_name])
             except Exception as exc:
                 self.logger.exception("best_version('%s'): %s:%d (%s) %s",
                     package_name, *traceback.extract_tb(sys.exc_info()[2])[0])
-                for requirement in self.mapping.get_requirements_by_package_name(package_name):
+                for requirement in requirements[package_name]:
                     previous_error = self.mapping.errors[package_name].get(requirement)
                     exception = previous_error['exception'] if previous_error else exc
                     errors[package_name][requirement] = {
@@ -226,6 +256,12 @@ class Install(Service):
             errors.update(self.mapping.errors)
         return installable_packages, errors
 
+    def wait(self, timeout=1.0):
+        # Block until any service reports progress. The timeout is just a
+        # safety net to keep the progress feedback alive.
+        self._tick.wait(timeout)
+        self._tick.clear()
+
     def retrieve_and_build(self):
         # Wait until all the packages have the chance to be processed
         while True:
@@ -244,14 +280,12 @@ class Install(Service):
             total = len(self.mapping.requirements)
             retrieved = self.mapping.count('downloader') + len(self.mapping.repeated)
             built = self.mapping.count('dependencer')
-
-            # Each package might have more than one requirement
-            failed = sum(len(x) for x in self.mapping.errors.values())
+            failed = self.mapping.count_errors()
             self.emit('update_retrieve_and_build',
                 total, retrieved, built, failed)
             if total == built + failed:
                 break
-            time.sleep(0.5)
+            self.wait()
 
         # Walk through all the requested requirements and queue their best
         # version
@@ -266,11 +300,11 @@ class Install(Service):
         while True:
             total = len(packages)
             installed = self.mapping.count('installer')
-            failed = sum(len(x) for x in self.mapping.errors.values())
+            failed = self.mapping.count_errors()
             self.emit('update_install', total, installed, failed)
             if total == installed + failed:
                 break
-            time.sleep(0.5)
+            self.wait()
 
         # Signaling failures that happened during the installation
         if self.mapping.errors:
@@ -283,11 +317,17 @@ class Install(Service):
         if not total:
             return total
 
+        # One thread per upload, so all the servers get their packages
+        # at the same time
+        self.uploader.size = min(total, UPLOAD_CONCURRENCY)
         self.uploader.start()
+        requirements = self.mapping.requirements_by_package_name()
         for server, package_names in failures.items():
             for package_name in package_names:
+                name = parse_requirement(package_name).name
                 try:
-                    _, requirement = self.mapping.best_version(package_name)
+                    _, requirement = self.mapping.best_version(
+                        name, requirements=requirements[name])
                 except VersionConflict:
                     continue
                 wheel = self.mapping.wheels[requirement]
@@ -302,7 +342,7 @@ class Install(Service):
             self.emit('update_upload', total, uploaded)
             if total == uploaded:
                 break
-            time.sleep(0.5)
+            self.wait()
 
     def run(self):
         packages = self.retrieve_and_build()
@@ -16,6 +16,7 @@
 
 from __future__ import absolute_import, unicode_literals, print_function
 from collections import defaultdict
+from threading import Lock
 from distlib.version import LegacyMatcher, LegacyVersion
 
 from . import util
@@ -42,12 +43,32 @@ class Mapping(object):
         self.dependencies = defaultdict(list)
         self.stats = defaultdict(int)
         self.errors = defaultdict(dict)
+        self.error_count = 0
+        self.errors_lock = Lock()
         self.wheels = {}
         self.repeated = []
 
     def count(self, service):
         return self.stats[service]
 
+    def file_error(self, requirement, exception, dependency_of=None):
+        # Called from the worker threads of all the services. Losing an
+        # increment would keep the `Install` loops waiting forever.
+        package_name = util.parse_requirement(requirement).name
+        with self.errors_lock:
+            if requirement not in self.errors[package_name]:
+                self.error_count += 1
+            self.errors[package_name][requirement] = {
+                'exception': exception,
+                'dependency_of': [dependency_of],
+            }
+
+    def count_errors(self):
+        # Each package might have more than one failed requirement. The
+        # counter is kept by `file_error()`, so we don't need to walk over
+        # all the errors every time the progress is reported.
+        return self.error_count
+
     def initially_required_packages(self):
         return set(util.parse_requirement(r).name for r in self.requirements)
 
@@ -64,17 +85,27 @@ class Mapping(object):
         return [x for x in self.requirements
             if util.parse_requirement(x).name == util.parse_requirement(package_name).name]
 
-    def available_versions(self, package_name):
+    def requirements_by_package_name(self):
+        # Same as calling `get_requirements_by_package_name()` for each
+        # package, but walking over the requirements only once
+        grouped = defaultdict(list)
+        for requirement in self.requirements:
+            grouped[util.parse_requirement(requirement).name].append(requirement)
+        return grouped
+
+    def available_versions(self, package_name, requirements=None):
+        if requirements is None:
+            requirements = self.get_requirements_by_package_name(package_name)
         return sorted(set(wheel_version(self.wheels[requirement])
-            for requirement in self.requirements
-                if self.wheels.get(requirement) and
-                    util.parse_requirement(requirement).name == package_name),
+            for requirement in requirements
+                if self.wheels.get(requirement)),
                       reverse=True)
 
-    def matching_versions(self, requirement):
+    def matching_versions(self, requirement, versions=None):
         matcher = LegacyMatcher(requirement.replace('-', '_'))
-        package_name = util.parse_requirement(requirement).name
-        versions = self.available_versions(package_name)
+        if versions is None:
+            package_name = util.parse_requirement(requirement).name
+            versions = self.available_versions(package_name)
         return [version for version in versions
             if matcher.match(version)]
 
@@ -87,9 +118,15 @@ class Mapping(object):
     def is_primary_requirement(self, requirement):
         return bool(self.dependencies[requirement].count(None))
 
-    def best_version(self, requirement_or_package_name, debug=False):
+    def best_version(self, requirement_or_package_name, debug=False,
+                     requirements=None):
         package_name = util.parse_requirement(requirement_or_package_name).name
-        requirements = self.get_requirements_by_package_name(package_name)
+        if requirements is None:
+            requirements = self.get_requirements_by_package_name(package_name)
+
+        # All the versions we have wheels for. Collected just once and
+        # then narrowed down for each requirement below
+        available_versions = self.available_versions(package_name, requirements)
 
         # Used to remember in which requirement we found each version
         requirements_by_version = {}
@@ -110,7 +147,7 @@ class Mapping(object):
             if self.is_primary_requirement(requirement):
                 primary_versions.append(version)
 
-            versions = self.matching_versions(requirement)
+            versions = self.matching_versions(requirement, available_versions)
             all_versions.extend(versions)
             all_constraints.append(util.safe_constraints(requirement))
 
@@ -129,8 +166,7 @@ class Mapping(object):
                 all_constraints), reverse=True))
             constraints = ' ({0})'.format(constraints) if constraints else ''
             available_versions = ', '.join(sorted(
-                self.available_versions(package_name),
-                reverse=True))
+                available_versions, reverse=True))
 
             # Just a nice message depending on finding any versions or
             # not
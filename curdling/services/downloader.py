@@ -20,6 +20,21 @@ POOL_MAX_SIZE = 10
 # Number of max redirect follows. See `http_retrieve()` for details.
 REDIRECT_LIMIT = 20
 
+# Protocols supported by `Downloader.download()` and the name of the method
+# that handles each one of them. Compiled just once, at import time.
+PROTOCOLS = (
+    (re.compile(r'^https?'), '_download_http'),
+    (re.compile(r'^git\+'), '_download_git'),
+    (re.compile(r'^hg\+'), '_download_hg'),
+    (re.compile(r'^svn\+'), '_download_svn'),
+)
+
+# Matches the `vcs+` prefix of URLs. See `Downloader.download()`.
+VCS_PREFIX = re.compile(r'^([^\+]+)\+([^:]+\:)')
+
+# Extracts the file name from the `content-disposition` header
+FILE_NAME = re.compile(r'filename=\"?([^;\"]+)')
+
 
 def get_locator(conf):
     curds = [CurdlingLocator(u) for u in conf.get('curdling_urls', [])]
@@ -313,16 +328,10 @@ class Downloader(Service):
 
         # Find out the right handler for the given protocol present in the
         # download url.
-        protocol_mapping = {
-            re.compile('^https?'): self._download_http,
-            re.compile('^git\+'): self._download_git,
-            re.compile('^hg\+'): self._download_hg,
-            re.compile('^svn\+'): self._download_svn,
-        }
-
         try:
-            handler = [i for i in protocol_mapping.keys() if i.findall(url)][0]
-        except IndexError:
+            handler = next(name for pattern, name in PROTOCOLS
+                           if pattern.match(url))
+        except StopIteration:
             raise UnknownURL(
                 util.spaces(3, '\n'.join([
                     '"{0}"'.format(url),
@@ -340,8 +349,8 @@ class Downloader(Service):
         # with `vcs+`. This RE is smart enough to handle plus (+)
         # signs out of the scheme. Like in this example:
         #   https://launchpad.com/path/+download/dirspec-13.10.tar.gz
-        url = re.sub('^([^\+]+)\+([^:]+\:)', r'\2', final_url)
-        return protocol_mapping[handler](url)
+        url = VCS_PREFIX.sub(r'\2', final_url)
+        return getattr(self, handler)(url)
 
     def _download_http(self, url):
         response, final_url = http_retrieve(self.opener, url)
@@ -360,7 +369,7 @@ class Downloader(Service):
 
         # Now that we're sure that our request was successful
         header = response.headers.get('content-disposition', '')
-        file_name = re.findall(r'filename=\"?([^;\"]+)', header)
+        file_name = FILE_NAME.findall(header)
         return field_name, self.index.from_data(
             file_name and file_name[0] or url,
             response.read(cache_content=True, decode_content=False))
@@ -2,17 +2,120 @@ from __future__ import absolute_import, print_function, unicode_literals
 from .base import Service
 from ..util import get_auth_info_from_url
 from distlib import compat
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
 
 import io
 import os
 import urllib3
 
 
+# Uploads are I/O bound, so there's no reason to tie the number of
+# uploader threads to the number of CPUs. See `Install.load_uploader()`.
+MAX_CONCURRENCY = 16
+
+# All the uploader instances share the same pool, so the connections to the
+# curdling servers are kept alive between uploads. It holds one connection
+# per uploader thread for each server to avoid throwing sockets away.
+POOL = urllib3.PoolManager(
+    num_pools=10, maxsize=MAX_CONCURRENCY, block=False)
+
+# HTTP method used to send packages to the server. See `Uploader.handle()`.
+PUT = str('PUT')
+
+# urllib3 rewinds request bodies before retrying them since 1.21. Older
+# versions would send whatever was left of the file under the original
+# `Content-Length`, so we don't let them retry uploads at all.
+if hasattr(getattr(urllib3.util, 'request', None), 'rewind_body'):
+    UPLOAD_PARAMS = {}
+else:
+    UPLOAD_PARAMS = {'retries': 0}
+
+
+class MultipartFile(object):
+    """File-like object that streams a file as a `multipart/form-data` body
+
+    The output is the same produced by `urllib3.encode_multipart_formdata()`
+    for a single file field, but the file contents are read in blocks as
+    the request is sent instead of being loaded into memory. It can also be
+    rewound, so the whole body is sent again when a request is retried.
+    """
+
+    def __init__(self, path, boundary=None):
+        self.boundary = boundary or choose_boundary()
+        file_name = os.path.basename(path)
+        field = RequestField.from_tuples(file_name, (file_name, b''))
+        head = '--{0}\r\n{1}'.format(
+            self.boundary, field.render_headers()).encode('utf-8')
+        tail = '\r\n--{0}--\r\n'.format(self.boundary).encode('utf-8')
+
+        self.file = io.open(path, 'rb')
+        try:
+            file_size = os.fstat(self.file.fileno()).st_size
+        except BaseException:
+            self.file.close()
+            raise
+
+        self.parts = [io.BytesIO(head), self.file, io.BytesIO(tail)]
+        self.sizes = [len(head), file_size, len(tail)]
+        self.size = sum(self.sizes)
+        self.position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def content_type(self):
+        return str('multipart/form-data; boundary={0}'.format(self.boundary))
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = b''.join(part.read() for part in self.parts)
+            self.position += len(data)
+            return data
+
+        # Move on to the next part until one of them gives us something
+        for part in self.parts:
+            data = part.read(size)
+            if data:
+                self.position += len(data)
+                return data
+        return b''
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self.position = min(max(offset, 0), self.size)
+
+        # Place each part at the position it would have if everything
+        # before `offset` had been read
+        remaining = self.position
+        for part, size in zip(self.parts, self.sizes):
+            part.seek(min(remaining, size))
+            remaining = max(remaining - size, 0)
+        return self.position
+
+    def close(self):
+        self.file.close()
+
+
 class Uploader(Service):
 
     def __init__(self, *args, **kwargs):
         super(Uploader, self).__init__(*args, **kwargs)
-        self.opener = urllib3.PoolManager()
+        self.opener = POOL
+
+        # Authentication headers for each server we upload to. All the
+        # packages sent to the same server share the same credentials.
+        self.auth_headers = {}
 
     def handle(self, requester, data):
         # Preparing the url to PUT the file
@@ -21,11 +124,19 @@ class Uploader(Service):
         file_name = os.path.basename(wheel)
         url = compat.urljoin(server, 'p/{0}'.format(file_name))
 
-        # Sending the file to the server. Both `method` and `url` parameters
-        # for calling `request_encode_body()` must be `str()` instances, not
-        # unicode.
-        contents = io.open(wheel, 'rb').read()
-        self.opener.request_encode_body(
-            b'PUT', bytes(url), {file_name: (file_name, contents)},
-            headers=get_auth_info_from_url(url))
+        if server not in self.auth_headers:
+            self.auth_headers[server] = get_auth_info_from_url(server)
+        headers = dict(self.auth_headers[server])
+
+        # The multipart body is streamed straight from the disk, so we
+        # must tell the server its size upfront. Both `method` and `url`
+        # parameters for calling `urlopen()` must be native `str()`
+        # instances: not unicode on Python 2 and not bytes on Python 3.
+        with MultipartFile(wheel) as body:
+            headers.update({
+                'Content-Type': body.content_type,
+                'Content-Length': str(body.size),
+            })
+            self.opener.urlopen(
+                PUT, str(url), body=body, headers=headers, **UPLOAD_PARAMS)
         return {'upload_url': url, 'requirement': data['requirement']}
@@ -102,27 +102,57 @@ def get_packages_from_args(args):
     return packages
 
 
+class ProgressOutput(object):
+    """Write the progress feedback, skipping lines that were just shown
+
+    The progress callbacks are called whenever anything happens in the
+    services, even if the numbers shown to the user didn't change.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.last = None
+
+    def write(self, msg):
+        if msg == self.last:
+            return
+        self.last = msg
+        stream = self.stream or sys.stdout
+        stream.write(msg)
+        stream.flush()
+
+
+PROGRESS_OUTPUT = ProgressOutput()
+
+# All the 11 possible states of the progress bar, from empty to full
+PROGRESS_BARS = tuple(('#' * i) + (' ' * (10 - i)) for i in range(11))
+
+
 def progress_bar(prefix, percent):
-    percent_count = int(percent / 10)
-    progress_bar = ('#' * percent_count) + (' ' * (10 - percent_count))
+    percent_count = min(percent // 10, 10)
+    progress_bar = PROGRESS_BARS[percent_count]
     return "\r\033[K{0}: [{1}] {2:>2}% ".format(prefix, progress_bar, percent)
 
 
+def percentage(done, total):
+    # Nothing to do means everything is done
+    return 100 * done // total if total else 100
+
+
 def progress(phrase, total, installed, failed=0):
-    percent = int((installed) / float(total) * 100.0)
+    percent = percentage(installed, total)
     msg = [progress_bar(phrase, percent)]
     if failed:
         msg.append("({0}/{1} - {2} failed)".format(
             installed, total, failed))
     else:
         msg.append("({0}/{1})".format(installed, total))
-    sys.stdout.write(''.join(msg))
-    sys.stdout.flush()
+    PROGRESS_OUTPUT.write(''.join(msg))
 
 
 def build_and_retrieve_progress(total, retrieved, built, failed):
     processed = built + failed
-    percent = int((processed) / float(total) * 100.0)
+    percent = percentage(processed, total)
     msg = [progress_bar('Retrieving', percent)]
     if failed:
         info = "({0} requested, {1} retrieved, {2} built, {3} failed)"
@@ -130,8 +160,7 @@ def build_and_retrieve_progress(total, retrieved, built, failed):
     else:
         msg.append("({0} requested, {1} retrieved, {2} processed)".format(
             total, retrieved, built))
-    sys.stdout.write(''.join(msg))
-    sys.stdout.flush()
+    PROGRESS_OUTPUT.write(''.join(msg))
 
 
 def show_report(failed=None):
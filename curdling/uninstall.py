@@ -32,13 +32,19 @@ class Uninstall(object):
         pass
 
     def request_uninstall(self, requirement):
-        self.packages.append(parse_requirement(requirement).name)
+        # The distributions found are cached, so we can't try to remove
+        # the same package twice
+        package_name = parse_requirement(requirement).name
+        if package_name not in self.packages:
+            self.packages.append(package_name)
 
     def run(self):
+        # Scan the installed distributions just once for all the packages
+        path = Database.distribution_path()
         for package in self.packages:
             self.logger.info("Removing package %s", package)
 
             try:
-                Database.uninstall(package)
+                Database.uninstall(package, path)
             except exceptions.PackageNotInstalled:
                 self.logger.error("Package %s does not exist, skipping", package)
@@ -21,6 +21,7 @@ from base64 import b64encode
 import io
 import os
 import re
+import mmap
 import hashlib
 import logging
 import subprocess
@@ -121,6 +122,24 @@ def expand_requirements(open_file):
 
 def filehash(f, algo, block_size=2**20):
     algo = getattr(hashlib, algo)()
+
+    # Real files that weren't read yet are mapped into memory and hashed
+    # straight from the page cache. Everything else (file-like objects,
+    # pipes, sockets, empty files and files already partially read) is
+    # read in blocks from the current position.
+    try:
+        if f.tell() != 0:
+            raise ValueError('File was already partially read')
+        contents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, ValueError, EnvironmentError):
+        pass
+    else:
+        try:
+            algo.update(contents)
+        finally:
+            contents.close()
+        return algo.hexdigest()
+
     while True:
         data = f.read(block_size)
         if not data:
@@ -25,6 +25,39 @@ def test_decorator_only():
     callback2.called.should.be.false
 
 
+def test_install_does_not_change_conf():
+    "Install() Should share its configuration with the services without changing it"
+
+    # Given that I have a configuration
+    index = Index('')
+    conf = {'index': index, 'pypi_urls': []}
+
+    # When I create the install command
+    install = Install(conf=conf)
+
+    # Then I see the configuration wasn't touched
+    conf.should.equal({'index': index, 'pypi_urls': []})
+
+    # And Then I see the services got the same configuration
+    install.finder.conf.should.be(conf)
+    install.finder.index.should.be(index)
+    install.finder.env.should.be(install)
+
+
+def test_install_conf_keys_are_not_service_params():
+    "Install() Should not pass the configuration keys as parameters to the services"
+
+    # Given that I have a configuration with a key that is also the name
+    # of a parameter of the services
+    conf = {'index': Index(''), 'size': 'not-a-number'}
+
+    # When I create the install command
+    install = Install(conf=conf)
+
+    # Then I see the services were still created with their default sizes
+    install.installer.size.should.be.an(int)
+
+
 def test_install_feed_when_theres_a_tarball_cached():
     "Install#feed() Should route the requirements that already have a tarball to the curdler"
 
@@ -156,6 +189,66 @@ def test_handle_filter_compatible_requirements():
     install.mapping.requirements.should.equal(set(['package (1.0)']))
 
 
+def test_handle_remember_directly_required_packages():
+    "Install#handle() Should check if a package was directly required just once"
+
+    # Given that I have the install command
+    index = Index('')
+    index.storage = {}
+    install = Install(conf={'index': index})
+
+    # And I mock the finder service end-point and spy on the mapping
+    install.finder.queue = Mock()
+    install.mapping.was_directly_required = Mock(
+        wraps=install.mapping.was_directly_required)
+    install.pipeline()
+
+    # When I handle a few requirements of the same package, requested by
+    # different packages
+    install.handle('tests', requirement='package (>= 1.0)', dependency_of='a')
+    install.handle('tests', requirement='package (>= 2.0)', dependency_of='b')
+    install.handle('tests', requirement='package (< 3.0)', dependency_of='c')
+
+    # Then I see that the mapping was asked only once
+    install.mapping.was_directly_required.assert_called_once_with('package (>= 1.0)')
+    install.directly_required.should.equal({'package': False})
+
+    # And When the user requires the package directly
+    install.handle('tests', requirement='package (2.5)')
+
+    # Then I see it's remembered as a primary requirement
+    install.directly_required.should.equal({'package': True})
+    install.finder.queue.call_count.should.equal(4)
+
+
+def test_handle_directly_required_entry_dropped_concurrently():
+    "Install#handle() Should not fail if unique() drops the directly required entry while it's being checked"
+
+    class DroppingDict(dict):
+        # Simulates `unique()` popping the entry from a worker thread
+        # right after `handle()` saves it
+        def __setitem__(self, key, value):
+            super(DroppingDict, self).__setitem__(key, value)
+            self.pop(key, None)
+
+    # Given that I have the install command
+    index = Index('')
+    index.storage = {}
+    install = Install(conf={'index': index})
+    install.directly_required = DroppingDict()
+
+    # And I mock the finder service end-point
+    install.finder.queue = Mock()
+    install.pipeline()
+
+    # When I handle a dependency while its entry gets dropped
+    install.handle('tests', requirement='package (>= 1.0)', dependency_of='a')
+
+    # Then I see the requirement was still handled
+    install.finder.queue.assert_called_once_with(
+        'tests', requirement='package (>= 1.0)', dependency_of='a')
+
+
 def test_handle_filter_dups():
     "Install#handle() Should skip duplicated requirements"
 
@@ -199,6 +292,12 @@ def test_handle_filter_blacklisted_packages():
     # Then I see it was just skipped
     install.finder.queue.called.should.be.false
 
+    # And When I handle a package that just starts with a blacklisted name
+    install.handle('tests', requirement='setuptools-git')
+
+    # Then I see it was not skipped
+    install.finder.queue.assert_called_once_with('tests', requirement='setuptools-git')
+
 
 def test_pipeline_update_mapping_stats():
     "Install#pipeline() Should update the Install#mapping#stats"
@@ -263,6 +362,38 @@ def test_pipeline_update_mapping_wheels():
     })
 
 
+def test_pipeline_wake_up_waiting_loops():
+    "Install#pipeline() Should wake up Install#wait() whenever a service finishes or fails"
+
+    # Given that I have the install command
+    install = Install(conf={})
+    install.pipeline()
+
+    # When the dependencer finishes processing a package
+    install.dependencer.emit(
+        'finished',
+        'tests',
+        requirement='pkg (0.1)',
+        wheel='pkg.whl')
+
+    # Then I see that the tick was set, so waiting loops won't sleep
+    install._tick.is_set().should.be.true
+
+    # And Then I see that waiting clears the tick again
+    install.wait(timeout=0)
+    install._tick.is_set().should.be.false
+
+    # And When the installer fails
+    install.installer.emit(
+        'failed',
+        'installer',
+        requirement='pkg (0.1)',
+        exception=Exception('P0wned!'))
+
+    # Then I see the tick was set again
+    install._tick.is_set().should.be.true
+
+
 def test_pipeline_finder_found_downloader():
     "Install#pipeline() should route the finder output to the downloader"
 
@@ -543,3 +674,44 @@ def test_load_installer_forward_errors():
     errors['package']['package']['exception'].should.be.a(ReportableError)
     str(errors['package']['package']['exception']).should.equal(
         'Requirement `package\' not found')
+
+
+def test_load_uploader():
+    "Install#load_uploader() Should start one uploader thread per package to upload"
+
+    # Given that I have the install command
+    install = Install(conf={})
+    install.pipeline()
+
+    # And I mock the uploader service
+    install.uploader.start = Mock()
+    install.uploader.queue = Mock()
+
+    # And that a curdling server doesn't have two of the packages we built
+    install.finder.get_servers_to_update = Mock(return_value={
+        'http://curd.srv/': ['package', 'another-package'],
+    })
+    install.mapping.requirements = set(['package (0.1)', 'another-package (0.1)'])
+    install.mapping.wheels = {
+        'package (0.1)': 'package-0.1-py27-none-any.whl',
+        'another-package (0.1)': 'another_package-0.1-py27-none-any.whl',
+    }
+
+    # When I load the uploader
+    install.load_uploader().should.equal(2)
+
+    # Then I see one thread per upload was started
+    install.uploader.size.should.equal(2)
+    install.uploader.start.assert_called_once_with()
+
+    # And Then I see both packages were queued
+    sorted(install.uploader.queue.call_args_list, key=lambda i: i[1]['wheel']).should.equal([
+        call('main',
+             wheel='another_package-0.1-py27-none-any.whl',
+             server='http://curd.srv/',
+             requirement='another-package (0.1)'),
+        call('main',
+             wheel='package-0.1-py27-none-any.whl',
+             server='http://curd.srv/',
+             requirement='package (0.1)'),
+    ])
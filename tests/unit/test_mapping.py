@@ -2,6 +2,8 @@ from __future__ import absolute_import, print_function, unicode_literals
 from curdling.mapping import Mapping
 from curdling import exceptions
 
+import threading
+
 
 def test_filed_packages():
     """Mapping#filed_packages() should return all packages requested based on all requirements we have.
@@ -23,6 +25,50 @@ def test_filed_packages():
     packages.should.equal(['forbiddenfruit', 'sure'])
 
 
+def test_file_error():
+    "Mapping#file_error() Should save errors by package name and keep them counted"
+
+    # Given that I have an empty mapping
+    mapping = Mapping()
+    error = Exception('P0wned!')
+
+    # When I file errors for two requirements of the same package, one of
+    # them twice
+    mapping.file_error('pkg (0.1)', error)
+    mapping.file_error('pkg (0.2)', error, 'other-pkg')
+    mapping.file_error('pkg (0.2)', error, 'other-pkg')
+
+    # Then I see both errors were saved under the package name
+    dict(mapping.errors).should.equal({
+        'pkg': {
+            'pkg (0.1)': {'exception': error, 'dependency_of': [None]},
+            'pkg (0.2)': {'exception': error, 'dependency_of': ['other-pkg']},
+        },
+    })
+
+    # And Then I see each requirement was counted once
+    mapping.count_errors().should.equal(2)
+
+
+def test_file_error_from_many_threads():
+    "Mapping#file_error() Should count all the errors filed concurrently"
+
+    # Given that I have an empty mapping
+    mapping = Mapping()
+    error = Exception('P0wned!')
+
+    # When a few threads file different errors at the same time
+    def file_errors(prefix):
+        for i in range(2000):
+            mapping.file_error('pkg-{0} ({1})'.format(prefix, i), error)
+    threads = [threading.Thread(target=file_errors, args=(n,)) for n in range(4)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+    # Then I see no error was lost
+    mapping.count_errors().should.equal(8000)
+
+
 def test_get_requirements_by_package_name():
     "Mapping#get_requirements_by_package_name() Should return a list of requirements that match a given package name"
 
@@ -39,6 +85,27 @@ def test_get_requirements_by_package_name():
     ])
 
 
+def test_requirements_by_package_name():
+    "Mapping#requirements_by_package_name() Should group all the requirements by their package names"
+
+    # Given that I have a mapping with some repeated requirements
+    mapping = Mapping()
+    mapping.requirements.add('sure (1.2.1)')
+    mapping.requirements.add('forbiddenfruit (0.1.1)')
+    mapping.requirements.add('forbiddenfruit (>= 0.0.5, < 0.0.7)')
+
+    # When I group the requirements
+    grouped = mapping.requirements_by_package_name()
+
+    # Then I see each package name has all its requirements
+    sorted(grouped.keys()).should.equal(['forbiddenfruit', 'sure'])
+    grouped['sure'].should.equal(['sure (1.2.1)'])
+    sorted(grouped['forbiddenfruit']).should.equal([
+        'forbiddenfruit (0.1.1)',
+        'forbiddenfruit (>= 0.0.5, < 0.0.7)',
+    ])
+
+
 def test_available_versions():
     "Mapping#available_versions() should list versions of all wheels for a certain package"
 
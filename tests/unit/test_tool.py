@@ -64,3 +64,44 @@ def test_initialize_logging():
             log_level=logging.DEBUG,
             log_name=mock.sentinel.log_name,
         )
+
+
+def test_progress_output():
+    "ProgressOutput#write() Should skip messages that were just written"
+
+    # Given that I have a progress output
+    stream = mock.Mock()
+    output = tool.ProgressOutput(stream)
+
+    # When I write the same message twice and then a different one
+    output.write('\r1/2')
+    output.write('\r1/2')
+    output.write('\r2/2')
+
+    # Then I see that the repeated message was written and flushed once
+    list(stream.write.call_args_list).should.equal([
+        mock.call('\r1/2'), mock.call('\r2/2')])
+    stream.flush.call_count.should.equal(2)
+
+
+def test_progress_bar():
+    "progress_bar() Should fill one slot of the bar for every 10 percent"
+
+    tool.progress_bar('Installing', 0).should.equal(
+        '\r\033[KInstalling: [          ]  0% ')
+    tool.progress_bar('Installing', 45).should.equal(
+        '\r\033[KInstalling: [####      ] 45% ')
+    tool.progress_bar('Installing', 100).should.equal(
+        '\r\033[KInstalling: [##########] 100% ')
+
+
+def test_percentage():
+    "percentage() Should return the integer percentage of the work done"
+
+    tool.percentage(0, 3).should.equal(0)
+    tool.percentage(1, 3).should.equal(33)
+    tool.percentage(2, 3).should.equal(66)
+    tool.percentage(3, 3).should.equal(100)
+
+    # Even when there's nothing to do
+    tool.percentage(0, 0).should.equal(100)
@@ -2,6 +2,8 @@ from __future__ import absolute_import, print_function, unicode_literals
 from mock import call, patch, Mock, ANY
 from curdling import util
 import io
+import os
+import tempfile
 
 
 def test_is_url():
@@ -93,6 +95,55 @@ def test_filehash():
     hashed.should.equal('a86c5dea3ad44078a1f79f9cf2c6786d')
 
 
+def test_filehash_real_file():
+    "filehash() should hash real files the same way it hashes file-like objects"
+
+    # Given that I have a real file
+    with tempfile.NamedTemporaryFile() as fp:
+        fp.write(b'My Content')
+        fp.flush()
+
+        # When I call the filehash function
+        with io.open(fp.name, 'rb') as f:
+            hashed = util.filehash(f, 'md5')
+
+    # Then I see the hash was right
+    hashed.should.equal('a86c5dea3ad44078a1f79f9cf2c6786d')
+
+
+def test_filehash_partially_read_file():
+    "filehash() should hash real files from their current position"
+
+    # Given that I have a real file that was partially read
+    with tempfile.NamedTemporaryFile() as fp:
+        fp.write(b'..My Content')
+        fp.flush()
+
+        # When I call the filehash function after reading the first bytes
+        with io.open(fp.name, 'rb') as f:
+            f.read(2)
+            hashed = util.filehash(f, 'md5')
+
+    # Then I see only the remaining content was hashed
+    hashed.should.equal('a86c5dea3ad44078a1f79f9cf2c6786d')
+
+
+def test_filehash_pipe():
+    "filehash() should hash file objects that can't be mapped into memory"
+
+    # Given that I have a pipe with some content
+    read_end, write_end = os.pipe()
+    os.write(write_end, b'My Content')
+    os.close(write_end)
+
+    # When I call the filehash function
+    with io.open(read_end, 'rb') as f:
+        hashed = util.filehash(f, 'md5')
+
+    # Then I see the hash was right
+    hashed.should.equal('a86c5dea3ad44078a1f79f9cf2c6786d')
+
+
 def test_spaces():
     "spaces() should add spaces to paragraphs"
 